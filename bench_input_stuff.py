@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+import timeit
+from typing import List, Optional
+
+from parse import parse
+
+from input_stuff import StrCaseConversion, compiled_parser, select
+from med import DOSAGE_PARSE_FORMAT
+
+_SCRIPT_NAME: Optional[str] = None
+_SCRIPT_USAGE: Optional[str] = None
+_SCRIPT_DESCRIPTION: Optional[str] = 'Measures the per-call cost of the input_stuff primitives against the ' \
+                                     'uncached implementations they replaced.'
+_SCRIPT_EPILOG: Optional[str] = None
+
+_OPTIONS = ('yes', 'no', 'stop asking')
+# ambiguous answers before the one that selects an option
+_ATTEMPTS = ('', '', '', 'st')
+
+
+def _replies(*answers):
+    it = iter(answers)
+    return lambda _: next(it)
+
+
+def _dict_convert(conversion: StrCaseConversion, s: str) -> str:
+    """The conversion used before direct dispatch: every case is computed on each call."""
+    return {StrCaseConversion.no_conversion: s,
+            StrCaseConversion.to_lower: s.lower(),
+            StrCaseConversion.to_upper: s.upper(),
+            StrCaseConversion.capitalize: s.capitalize(),
+            StrCaseConversion.casefold: s.casefold()}[conversion]
+
+
+def _scan_select(question: str, options, input_func) -> Optional[str]:
+    """The select loop used before the prefix table: the prompt and matches are rebuilt on every attempt."""
+    while True:
+        prompt_option_str = f'({"/".join(options)})'
+        result = StrCaseConversion.casefold(input_func(f'{question} {prompt_option_str}: ').strip())
+        found = [o for o in options if o.startswith(result)]
+        if len(found) == 1:
+            return found[0]
+
+
+def main(args: Optional[List[str]]):
+    """Executes the script. Use '-h' argument to see help info."""
+    import argparse
+
+    ap: argparse.ArgumentParser = argparse.ArgumentParser(prog=_SCRIPT_NAME,
+                                                          usage=_SCRIPT_USAGE,
+                                                          description=_SCRIPT_DESCRIPTION,
+                                                          epilog=_SCRIPT_EPILOG)
+    ap.add_argument('-n', '--number', action='store', type=int, default=20000,
+                    help='The number of calls timed per case. default=20000')
+    args = ap.parse_args(args)
+    n = args.number
+
+    cases = [('parse dosage',
+              lambda: parse(DOSAGE_PARSE_FORMAT, '30.5ml'),
+              lambda: compiled_parser(DOSAGE_PARSE_FORMAT).parse('30.5ml')),
+             ('case conversion',
+              lambda: _dict_convert(StrCaseConversion.casefold, 'Stop Asking'),
+              lambda: StrCaseConversion.casefold('Stop Asking')),
+             ('select, 4 attempts',
+              lambda: _scan_select('?', _OPTIONS, _replies(*_ATTEMPTS)),
+              lambda: select('?', _OPTIONS, input_func=_replies(*_ATTEMPTS)))]
+    for name, before, after in cases:
+        before_us = timeit.timeit(before, number=n) / n * 1e6
+        after_us = timeit.timeit(after, number=n) / n * 1e6
+        print(f'{name}: {before_us:.2f}us -> {after_us:.2f}us ({before_us / after_us:.1f}x)')
+
+
+if __name__ == '__main__':
+    from sys import argv
+    main(argv[1:])
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+import json
+import os
+import tempfile
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import List, Optional
+
+from json_stuff import NewJSONDecoder
+from med import Med, MedRegistry
+
+_SCRIPT_NAME: Optional[str] = None
+_SCRIPT_USAGE: Optional[str] = None
+_SCRIPT_DESCRIPTION: Optional[str] = 'Compares MedRegistry.preload with loading the meds one at a time.'
+_SCRIPT_EPILOG: Optional[str] = None
+
+
+def _serial_load(directory) -> dict:
+    """The loop used by find_near_matches before preload existed."""
+    meds = {}
+    for f in os.listdir(directory):
+        with open(Path(directory, f), 'r') as file:
+            obj = json.load(file, cls=NewJSONDecoder)
+            if isinstance(obj, Med):
+                meds[obj.name] = obj
+    return meds
+
+
+def _timed(func, *args, **kwargs) -> float:
+    start = time.perf_counter()
+    func(*args, **kwargs)
+    return time.perf_counter() - start
+
+
+def main(args: Optional[List[str]]):
+    """Executes the script. Use '-h' argument to see help info."""
+    import argparse
+
+    ap: argparse.ArgumentParser = argparse.ArgumentParser(prog=_SCRIPT_NAME,
+                                                          usage=_SCRIPT_USAGE,
+                                                          description=_SCRIPT_DESCRIPTION,
+                                                          epilog=_SCRIPT_EPILOG)
+    ap.add_argument('-n', '--count', action='store', type=int, nargs='+', default=[10000, 50000],
+                    help='The numbers of med files to benchmark with. default=10000 50000')
+    ap.add_argument('-w', '--workers', action='store', type=int, default=None,
+                    help='The number of workers passed to preload.')
+    args = ap.parse_args(args)
+
+    for count in args.count:
+        with tempfile.TemporaryDirectory() as directory:
+            for i in range(count):
+                MedRegistry.register(Med(name=f'med {i}',
+                                         standard_dose_amount=5,
+                                         standard_dose_unit='ml',
+                                         time_between_standard_doses=timedelta(hours=4),
+                                         max_standard_doses_per_day=4),
+                                     directory=directory)
+            serial = _timed(_serial_load, directory)
+            threads = _timed(MedRegistry.preload, directory, workers=args.workers)
+            processes = _timed(MedRegistry.preload, directory, workers=args.workers, use_processes=True)
+            print(f'{count} meds: serial {serial:.2f}s, '
+                  f'preload threads {threads:.2f}s ({serial / threads:.1f}x), '
+                  f'preload threads+processes {processes:.2f}s ({serial / processes:.1f}x)')
+
+
+if __name__ == '__main__':
+    from sys import argv
+    main(argv[1:])
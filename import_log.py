@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+import csv
+import datetime
+import json
+import time
+from typing import List, Optional, Iterator, Iterable, TextIO, Union
+
+# Help Documentation Constants
+import units
+from input_stuff import compiled_parser
+from med import Med, MedRegistry, DOSAGE_PARSE_FORMAT
+from med_log import DEFAULT_DATE_TIME_FORMAT, MedLogEntry, write_entries, refresh_snapshot
+
+_SCRIPT_NAME: Optional[str] = None
+_SCRIPT_USAGE: Optional[str] = None
+_SCRIPT_DESCRIPTION: Optional[str] = 'Imports dose records from CSV or JSONL files into the med log.'
+_SCRIPT_EPILOG: Optional[str] = 'Each record needs a "medicine" and "time" field and may have a "dosage" field ' \
+                                '(e.g. "30ml"). Records without a dosage use the standard dose of the medicine.'
+
+# Script Default Constants
+DEFAULT_BATCH_SIZE = 10000
+_MAX_REPORTED_ERRORS = 20
+_DOSAGE_PARSER = compiled_parser(DOSAGE_PARSE_FORMAT)
+
+
+class ImportReport:
+    """Counts and problems collected while importing. Only the first few invalid rows are kept."""
+    def __init__(self):
+        self.rows: int = 0
+        self.imported: int = 0
+        self.invalid: int = 0
+        self.errors: List[str] = []
+        self.unknown: dict[str, int] = {}
+        self.suggestions: dict[str, List[str]] = {}
+        self.seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds else 0.0
+
+    def error(self, row_number: int, msg: str):
+        self.invalid += 1
+        if len(self.errors) < _MAX_REPORTED_ERRORS:
+            self.errors.append(f'row {row_number}: {msg}')
+
+    def __str__(self):
+        lines = [f'{self.imported} of {self.rows} rows imported in {self.seconds:.2f}s '
+                 f'({self.rows_per_second:.0f} rows/s)']
+        if self.invalid:
+            lines.append(f'{self.invalid} invalid rows:')
+            lines.extend(f'    {e}' for e in self.errors)
+            if self.invalid > len(self.errors):
+                lines.append(f'    ... {self.invalid - len(self.errors)} more')
+        for name, count in self.unknown.items():
+            suggestions = ', '.join(self.suggestions[name]) or 'no similar medicines'
+            lines.append(f'unknown medicine {name!r} ({count} rows). Did you mean: {suggestions}')
+        return '\n'.join(lines)
+
+
+def read_records(file: TextIO, file_format: str) -> Iterator[Union[dict, ValueError]]:
+    """Yields records one at a time from a CSV file with a header row or a JSONL file.
+
+    A JSONL line that cannot be decoded is yielded as its ValueError so the caller can report it and carry on.
+    """
+    if file_format == 'csv':
+        yield from csv.DictReader(file)
+    elif file_format == 'jsonl':
+        for line in file:
+            if line.strip():
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    yield e
+    else:
+        raise ValueError(f'Unsupported file format {file_format!r}.')
+
+
+def import_records(records: Iterable[Union[dict, ValueError]],
+                   *,
+                   time_format: str = DEFAULT_DATE_TIME_FORMAT,
+                   meds_dir=None,
+                   log_file=None,
+                   batch_size: int = DEFAULT_BATCH_SIZE) -> ImportReport:
+    """Validates records and writes them to the log in sorted batches of at most batch_size entries.
+
+    Each distinct medicine name is looked up once. Unknown names are collected in the report together with the near
+    matches found in the registry.
+    """
+    report = ImportReport()
+    meds: dict[str, Optional[Med]] = {}
+    batch: List[MedLogEntry] = []
+    start = time.perf_counter()
+
+    for row_number, record in enumerate(records, start=1):
+        report.rows += 1
+        if isinstance(record, ValueError):
+            report.error(row_number, f'invalid record: {record}')
+            continue
+        if not isinstance(record, dict):
+            report.error(row_number, f'expected an object, got {type(record).__name__}')
+            continue
+        med_name = (record.get('medicine') or '').strip()
+        if not med_name:
+            report.error(row_number, 'missing medicine')
+            continue
+        if med_name not in meds:
+            try:
+                meds[med_name] = MedRegistry.get(med_name, directory=meds_dir)
+            except KeyError:
+                meds[med_name] = None
+                matches = MedRegistry.find_near_matches(med_name, directory=meds_dir)
+                report.suggestions[med_name] = [m.med.name for m in matches]
+        med = meds[med_name]
+        if med is None:
+            report.unknown[med_name] = report.unknown.get(med_name, 0) + 1
+            continue
+
+        dosage = str(record.get('dosage') or '').replace(' ', '')
+        if dosage:
+            result = _DOSAGE_PARSER.parse(dosage)
+            if result is None or result[0] < 0:
+                report.error(row_number, f'invalid dosage {dosage!r}')
+                continue
+            amount, unit = result
+            try:
+                units.check_compatible(unit, med.standard_dose_unit)
+            except ValueError as e:
+                report.error(row_number, str(e))
+                continue
+        else:
+            amount, unit = med.standard_dose_amount, med.standard_dose_unit
+
+        try:
+            t = datetime.datetime.strptime(str(record.get('time') or '').strip(), time_format)
+        except ValueError:
+            report.error(row_number, f'invalid time {record.get("time")!r}')
+            continue
+
+        batch.append(MedLogEntry(med=med,
+                                 dose_administrated_amount=amount,
+                                 dose_administrated_unit=unit,
+                                 dose_administrated_date_time=t))
+        if len(batch) >= batch_size:
+            report.imported += write_entries(batch, log_file)
+            batch = []
+
+    if batch:
+        report.imported += write_entries(batch, log_file)
+    if report.imported:
+        refresh_snapshot(log_file)
+    report.seconds = time.perf_counter() - start
+    return report
+
+
+def main(args: Optional[List[str]]):
+    """Executes the script. Use '-h' argument to see help info."""
+    import argparse
+
+    # Setup the argument parser
+    ap: argparse.ArgumentParser = argparse.ArgumentParser(prog=_SCRIPT_NAME,
+                                                          usage=_SCRIPT_USAGE,
+                                                          description=_SCRIPT_DESCRIPTION,
+                                                          epilog=_SCRIPT_EPILOG)
+
+    # setup normal args
+    ap.add_argument('files', nargs='+', help='The CSV or JSONL files to import. Use \'-\' to read stdin.')
+    ap.add_argument('--file-format',
+                    action='store',
+                    choices=('csv', 'jsonl'),
+                    default=None,
+                    help='The format of the input. Guessed from the file extension by default.')
+    ap.add_argument('-f', '--format',
+                    action='store',
+                    default=DEFAULT_DATE_TIME_FORMAT,
+                    help='The format to parse the date-time. default=\'%%m/%%d/%%Y %%H:%%M\'. '
+                         'See: https://docs.python.org/3/library/datetime.html#strftime-strptime-behavior')
+    ap.add_argument('-b', '--batch-size',
+                    action='store',
+                    type=int,
+                    default=DEFAULT_BATCH_SIZE,
+                    help=f'The number of rows sorted and written at once. default={DEFAULT_BATCH_SIZE}')
+    ap.add_argument('--meds-dir',
+                    action='store',
+                    default=None,
+                    help='The directory where medicine files are stored.')
+    ap.add_argument('-o', '--output-file',
+                    action='store',
+                    default=None,
+                    help='The log file to import into.')
+
+    # Setup output group
+    ap.output_group = ap.add_mutually_exclusive_group()
+    ap.output_group.add_argument('-v', '--verbose', action='store_true', help='Outputs more information.')
+    ap.output_group.add_argument('-q', '--quiet', action='store_true', help='Reduces output.')
+
+    # Parse the args
+    args = ap.parse_args(args)
+
+    for filename in args.files:
+        file_format = args.file_format
+        if file_format is None:
+            file_format = 'jsonl' if filename.endswith(('.jsonl', '.json')) else 'csv'
+        if filename == '-':
+            from sys import stdin
+            report = import_records(read_records(stdin, file_format),
+                                    time_format=args.format,
+                                    meds_dir=args.meds_dir,
+                                    log_file=args.output_file,
+                                    batch_size=args.batch_size)
+        else:
+            with open(filename, 'r', newline='') as file:
+                report = import_records(read_records(file, file_format),
+                                        time_format=args.format,
+                                        meds_dir=args.meds_dir,
+                                        log_file=args.output_file,
+                                        batch_size=args.batch_size)
+        if not args.quiet:
+            print(f'{filename}: {report}')
+
+
+if __name__ == '__main__':
+    from sys import argv
+    main(argv[1:])
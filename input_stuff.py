@@ -1,7 +1,16 @@
+import functools
 from enum import Enum, auto
 from typing import Optional, Collection, Callable, Union, List, Tuple, Any, overload
 
-from parse import parse
+from parse import Parser
+
+PARSER_CACHE_SIZE = 256
+
+
+@functools.lru_cache(maxsize=PARSER_CACHE_SIZE)
+def compiled_parser(pattern: str) -> Parser:
+    """Returns a compiled parse.Parser for the pattern. The most recently used parsers are kept."""
+    return Parser(pattern)
 
 
 class StrCaseConversion(Enum):
@@ -12,16 +21,19 @@ class StrCaseConversion(Enum):
     casefold = auto()
 
     def convert(self, s: str):
-        return {StrCaseConversion.no_conversion: s,
-                StrCaseConversion.to_lower: s.lower(),
-                StrCaseConversion.to_upper: s.upper(),
-                StrCaseConversion.capitalize: s.capitalize(),
-                StrCaseConversion.casefold: s.casefold()}[self]
+        return _CASE_CONVERSIONS[self](s)
 
     def __call__(self, s):
         return self.convert(s)
 
 
+_CASE_CONVERSIONS: dict[StrCaseConversion, Callable[[str], str]] = {StrCaseConversion.no_conversion: str,
+                                                                    StrCaseConversion.to_lower: str.lower,
+                                                                    StrCaseConversion.to_upper: str.upper,
+                                                                    StrCaseConversion.capitalize: str.capitalize,
+                                                                    StrCaseConversion.casefold: str.casefold}
+
+
 def parsed_input(prompt,
                  *,
                  pattern='{}',
@@ -49,6 +61,7 @@ def parsed_input(prompt,
     Returns:
         The Result object from parse call or the default.
     """
+    parser = compiled_parser(pattern)
     while True:
         input_str: str = input_func(prompt)
 
@@ -60,7 +73,7 @@ def parsed_input(prompt,
         if not input_str and allow_none:
             return default
         elif input_str:
-            result = parse(pattern, input_str)
+            result = parser.parse(input_str)
             if result and validation:
                 if isinstance(validation, dict):
                     for name, validate in validation.items():
@@ -92,18 +105,19 @@ def select(question: str,
            allow_none: bool = False,
            case_conversion: StrCaseConversion = StrCaseConversion.casefold,
            options_are_abbreviations:bool = False) -> Optional[str]:
+    prompt_option_str = f'{option_enclosure[0]}{option_separator.join(options)}{option_enclosure[1]}'
+    prompt = f'{question} {prompt_option_str}: '
+    prefix_table = _cached_prefix_table(options) if isinstance(options, tuple) else _prefix_table(options)
     while True:
-        prompt_option_str = f'{option_enclosure[0]}{option_separator.join(options)}{option_enclosure[1]}'
-        result = input_func(f'{question} {prompt_option_str}: ')
+        result = input_func(prompt)
 
         result = case_conversion(result.strip()) if should_strip else case_conversion(result)
         if not result and allow_none:
             return None
 
-        if isinstance(options, dict):
-            found = [v for k, v in options.items() if k.startswith(result)]
-        else:
-            found = [o for o in options if o.startswith(result) or (options_are_abbreviations and result.startswith(o))]
+        found = prefix_table.get(result, [])
+        if options_are_abbreviations and not isinstance(options, dict):
+            found = [o for o in options if o in found or result.startswith(o)]
         if len(found) == 1:
             return found[0]
         else:  # check for exact match
@@ -112,6 +126,21 @@ def select(question: str,
                     return s
 
 
+def _prefix_table(options: Union[list, tuple, dict]) -> dict[str, list]:
+    """Maps every prefix of the options (or dict keys) to the options (or dict values) that start with it."""
+    items = options.items() if isinstance(options, dict) else ((o, o) for o in options)
+    table: dict[str, list] = {}
+    for key, value in items:
+        for i in range(len(key) + 1):
+            table.setdefault(key[:i], []).append(value)
+    return table
+
+
+@functools.lru_cache(maxsize=PARSER_CACHE_SIZE)
+def _cached_prefix_table(options: tuple) -> dict[str, list]:
+    return _prefix_table(options)
+
+
 @overload
 def yn(question: str,
        *,
@@ -1,13 +1,14 @@
 #!/usr/bin/env python3
 import datetime
-from typing import List, Optional
+import shlex
+import sys
+from typing import List, Optional, Iterable, Callable
 
 # Help Documentation Constants
-from parse import parse
-
-from input_stuff import parsed_input, yn, select
+import units
+from input_stuff import parsed_input, yn, select, compiled_parser
 from med import MedRegistry, DOSAGE_PARSE_FORMAT
-from med_log import DEFAULT_DATE_TIME_FORMAT, log, next_dose
+from med_log import DEFAULT_DATE_TIME_FORMAT, log, next_dose, load_state, open_log, MedLogEntry
 
 _SCRIPT_NAME: Optional[str] = None
 _SCRIPT_USAGE: Optional[str] = None
@@ -16,6 +17,100 @@ _SCRIPT_EPILOG: Optional[str] = None
 
 # Script Default Constants
 _SCRIPT_IS_INTERACTIVE_BY_DEFAULT = False
+_BATCH_BUFFER_SIZE = 1024 * 1024
+_DOSAGE_PARSER = compiled_parser(DOSAGE_PARSE_FORMAT)
+_BATCH_OPTIONS = {'-m': 'medicine', '--medicine': 'medicine',
+                  '-d': 'dosage', '--dosage': 'dosage',
+                  '-t': 'time', '--time': 'time'}
+
+
+def _is_compatible_unit(unit: str, expected: str) -> bool:
+    try:
+        units.check_compatible(unit, expected)
+    except ValueError:
+        return False
+    return True
+
+
+def _parse_batch_line(line: str) -> dict:
+    """Parses the -m/-d/-t options of one batch line. Raises ValueError if the line is malformed."""
+    tokens = shlex.split(line)
+    options = {}
+    i = 0
+    while i < len(tokens):
+        option, has_value, value = tokens[i].partition('=')
+        if option not in _BATCH_OPTIONS:
+            raise ValueError(f'unknown option {tokens[i]!r}')
+        if not has_value:
+            i += 1
+            if i == len(tokens):
+                raise ValueError(f'{option} expects a value')
+            value = tokens[i]
+        options[_BATCH_OPTIONS[option]] = value
+        i += 1
+    if 'medicine' not in options:
+        raise ValueError('the medicine is required')
+    return options
+
+
+def run_batch(lines: Iterable[str],
+              *,
+              time_format: str,
+              meds_dir=None,
+              log_file=None,
+              stream: bool = False,
+              output: Callable = print) -> int:
+    """Logs one dose per line using the same -m/-d/-t options as the command line.
+
+    Meds are looked up once per name and all entries go through one buffered writer. The next dose of each med is
+    output once at the end, or after every line if stream is True. Malformed lines are reported on stderr and skipped.
+
+    Returns:
+        The number of lines that could not be logged.
+    """
+    meds = {}  # name as given -> Med, so each spelling is looked up once
+    logged_meds = {}  # Med.name -> Med, so each med is output once
+    failures = 0
+    state = load_state(log_file) if stream else None
+    with open_log(log_file, buffering=_BATCH_BUFFER_SIZE) as file:
+        for line_number, line in enumerate(lines, start=1):
+            if not line.strip():
+                continue
+            try:
+                options = _parse_batch_line(line)
+                med_name = options['medicine']
+                if med_name not in meds:
+                    meds[med_name] = MedRegistry.get(med_name, directory=meds_dir)
+                med = meds[med_name]
+                amount, unit = med.standard_dose_amount, med.standard_dose_unit
+                if 'dosage' in options:
+                    dosage = _DOSAGE_PARSER.parse(options['dosage'])
+                    if dosage is None:
+                        raise ValueError(f'invalid dosage {options["dosage"]!r}')
+                    amount, unit = dosage
+                    units.check_compatible(unit, med.standard_dose_unit)
+                t = datetime.datetime.strptime(options['time'], time_format) if 'time' in options \
+                    else datetime.datetime.now()
+            except (KeyError, ValueError) as e:
+                failures += 1
+                print(f'line {line_number}: {e}', file=sys.stderr)
+                continue
+
+            entry = MedLogEntry(med=med,
+                                dose_administrated_amount=amount,
+                                dose_administrated_unit=unit,
+                                dose_administrated_date_time=t)
+            entry_str = f'{entry}\n'
+            file.write(entry_str)
+            logged_meds[med.name] = med
+            if stream:
+                state.add(entry_str, med)
+                output(f'{med.name} {state.next_dose(med)}')
+
+    if not stream:
+        for med in logged_meds.values():
+            output(f'{med.name} {next_dose(med, log_file)}')
+    return failures
 
 
 
@@ -71,6 +166,12 @@ def main(args: Optional[List[str]]):
 
         if not _SCRIPT_IS_INTERACTIVE_BY_DEFAULT:
             ap.add_argument('--interactive', action='store_true', help='Allow user interaction during execution.')
+        ap.add_argument('--batch',
+                        action='store_true',
+                        help='Reads one dose per line from stdin using the -m, -d and -t options.')
+        ap.add_argument('--stream',
+                        action='store_true',
+                        help='In batch mode, prints the next dose after every line instead of once per medicine.')
 
         # Parse the args
         args = ap.parse_args(args)
@@ -84,12 +185,22 @@ def main(args: Optional[List[str]]):
         med_name = args.medicine
         dosage = args.dosage
         if dosage:
-            dosage = parse(DOSAGE_PARSE_FORMAT, dosage)
+            dosage = _DOSAGE_PARSER.parse(dosage)
         time_str = args.time
         time_format = args.format
         meds_dir = args.meds_dir
         log_file = args.output_file
 
+        if args.batch:
+            failures = run_batch(sys.stdin,
+                                 time_format=time_format,
+                                 meds_dir=meds_dir,
+                                 log_file=log_file,
+                                 stream=args.stream)
+            if failures:
+                raise SystemExit(1)
+            return
+
         # get needed input if in interactive mode
         if is_interactive:
             med = None
@@ -122,7 +233,9 @@ def main(args: Optional[List[str]]):
                 default_str = f'{med.standard_dose_amount}{med.standard_dose_unit}'
                 dosage = parsed_input(f'Dose administered (default: {default_str}): ',
                                       pattern=DOSAGE_PARSE_FORMAT,
-                                      validation=(lambda x: x >= 0, lambda x: True),
+                                      help_msg=f'The unit must be convertible to {med.standard_dose_unit!r}.',
+                                      validation=(lambda x: x >= 0,
+                                                  lambda x: _is_compatible_unit(x, med.standard_dose_unit)),
                                       allow_none=True,
                                       default=None)
             if not time_format:
@@ -148,7 +261,11 @@ def main(args: Optional[List[str]]):
         for k, v in kwargs.copy().items():
             if v is None:
                 del kwargs[k]
-        log(**kwargs)
+        try:
+            log(**kwargs)
+        except ValueError as e:
+            print(e, file=sys.stderr)
+            raise SystemExit(1)
         print(next_dose(med))
 
 
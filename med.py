@@ -1,6 +1,7 @@
 import dataclasses
 import os
 import pathlib
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 from dataclasses import dataclass
 from datetime import timedelta
 from functools import total_ordering
@@ -45,7 +46,33 @@ class Med(JSONSerializable):
         ...
 
 
+def _read_text(path) -> str:
+    with open(path, 'r') as file:
+        return file.read()
+
+
+def _decode(text: str) -> Any:
+    return json.loads(text, cls=NewJSONDecoder)
+
+
+def _read_and_decode(path) -> Any:
+    return _decode(_read_text(path))
+
+
 class MedRegistry:
+    # resolved directory -> registry filename -> Med, filled by preload
+    _preloaded: dict[str, dict[str, Med]] = {}
+
+    @classmethod
+    def _directory_key(cls, directory) -> str:
+        return str(Path(directory).resolve())
+
+    @classmethod
+    def _preloaded_meds(cls, directory) -> Optional[dict[str, Med]]:
+        # skip resolving the directory on the common path where nothing was preloaded
+        if not cls._preloaded:
+            return None
+        return cls._preloaded.get(cls._directory_key(directory))
 
     @classmethod
     def _convert_name_to_filename(cls, name: str) -> str:
@@ -59,6 +86,9 @@ class MedRegistry:
         filename = MedRegistry._convert_name_to_filename(med.name)
         with open(Path(directory, filename), 'w') as file:
             json.dump(med, file, cls=NewJSONEncoder, indent=4)
+        preloaded = MedRegistry._preloaded_meds(directory)
+        if preloaded is not None:
+            preloaded[filename] = med
 
     @classmethod
     def get(cls,
@@ -69,6 +99,9 @@ class MedRegistry:
             directory = DEFAULT_MED_DIRECTORY
         assert Path(directory).is_dir(), f'{str(Path(directory).absolute())!r} is not a directory'
         filename = MedRegistry._convert_name_to_filename(med_name)
+        preloaded = MedRegistry._preloaded_meds(directory)
+        if preloaded is not None and filename in preloaded:
+            return preloaded[filename]
 
         try:
             with open(Path(directory, filename), 'r') as file:
@@ -76,6 +109,53 @@ class MedRegistry:
         except FileNotFoundError:
             raise KeyError(f'The medicine {med_name!r} is not registered.')
 
+    @classmethod
+    def preload(cls,
+                directory=None,
+                *,
+                workers: Optional[int] = None,
+                use_processes: bool = False) -> dict[str, Med]:
+        """Loads every med in a directory concurrently and keeps them for later get and find_near_matches calls.
+
+        The kept meds are a snapshot of the directory at the time of the call: meds registered through register are
+        added, but files changed or removed by anything else are not seen until preload is called again or
+        clear_preloaded is called.
+
+        Args:
+            directory: The directory where medicine files are stored.
+            workers: The number of threads (and processes) to use. See concurrent.futures for the default.
+            use_processes: A bool indicating if the JSON should be decoded in a process pool instead of the threads
+                reading the files.
+
+        Returns:
+            A mapping of med name to Med.
+        """
+        if directory is None:
+            directory = DEFAULT_MED_DIRECTORY
+        assert Path(directory).is_dir(), f'{str(Path(directory).absolute())!r} is not a directory'
+        with os.scandir(directory) as entries:
+            paths = [e.path for e in entries if e.name.endswith('.json') and e.is_file()]
+
+        with ThreadPoolExecutor(workers) as pool:
+            if use_processes:
+                texts = list(pool.map(_read_text, paths))
+                with ProcessPoolExecutor(workers) as process_pool:
+                    objs = list(process_pool.map(_decode, texts, chunksize=max(1, len(texts) // 64)))
+            else:
+                objs = list(pool.map(_read_and_decode, paths))
+
+        preloaded = {os.path.basename(path): obj for path, obj in zip(paths, objs) if isinstance(obj, Med)}
+        MedRegistry._preloaded[MedRegistry._directory_key(directory)] = preloaded
+        return {med.name: med for med in preloaded.values()}
+
+    @classmethod
+    def clear_preloaded(cls, directory=None):
+        """Forgets the meds kept by preload for a directory, or for every directory if none is given."""
+        if directory is None:
+            MedRegistry._preloaded.clear()
+        else:
+            MedRegistry._preloaded.pop(MedRegistry._directory_key(directory), None)
+
     @classmethod
     def interactice_register(cls, med_name) -> Med:
 
@@ -164,13 +244,17 @@ class MedRegistry:
                     raise TypeError(f'{_Candidate.__name__} objects cannot be compared objects of any other type.')
                 return self.difference.__lt__(other.difference)
 
-        files = os.listdir(directory)
-        meds = []
-        for f in files:
-            with open(Path(directory, f), 'r') as file:
-                obj: Med = json.load(file, cls=NewJSONDecoder)
-                if isinstance(obj, Med):
-                    meds.append(obj)
+        preloaded = MedRegistry._preloaded_meds(directory)
+        if preloaded is not None:
+            meds = list(preloaded.values())
+        else:
+            meds = []
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.name.endswith('.json') and entry.is_file():
+                        obj: Med = _read_and_decode(entry.path)
+                        if isinstance(obj, Med):
+                            meds.append(obj)
         candidates = [_Candidate(med_name, m) for m in meds]
         candidates.sort()
         candidates = [c for c in candidates if cutoff is None or c.difference < cutoff]
@@ -1,14 +1,24 @@
 from __future__ import annotations
+import json
+import os
 from dataclasses import dataclass, Field
 from datetime import datetime, timedelta
-from typing import Union, Optional, Tuple, List
-
-from parse import parse
+from pathlib import Path
+from typing import Union, Optional, Tuple, List, Iterator, Iterable, TextIO
 
+import units
+from input_stuff import compiled_parser
 from med import Med, MedRegistry, DOSAGE_PARSE_FORMAT
 
 DEFAULT_LOG_FILE = 'logs/med.log'
 DEFAULT_DATE_TIME_FORMAT = r'%m/%d/%Y %H:%M'
+# strftime format naming the segment an entry is rotated into. Every rotation, write and read of segments uses it, so
+# all segments of a log share one key format. Keys must sort chronologically as strings and parse back with strptime.
+SEGMENT_FORMAT = r'%Y-%m'
+# Number of unreplayed bytes in the active log after which next_dose writes a new snapshot.
+DEFAULT_CHECKPOINT_INTERVAL = 64 * 1024
+
+_DOSAGE_PARSER = compiled_parser(DOSAGE_PARSE_FORMAT)
 
 class NextDose:
     def __init__(self, *, entry=None, med=None, t_override=None):
@@ -49,26 +59,408 @@ class MedLogEntry:
         t = self.dose_administrated_date_time.strftime(DEFAULT_DATE_TIME_FORMAT)
         return f'{t} {self.med.name} {self.dose_administrated_amount}{self.dose_administrated_unit}'
 
-    @classmethod
-    def from_str(cls, s: str) -> MedLogEntry:
-        words = s.split(' ')
+    @staticmethod
+    def split_str(s: str) -> Tuple[datetime, str, str]:
+        """Splits a log line into its date-time, med name and dosage string without touching the registry."""
+        words = s.rstrip('\n').split(' ')
         date, time = words[:2]
         datetime_obj = datetime.strptime(f'{date} {time}', DEFAULT_DATE_TIME_FORMAT)
-        dose_amount, dose_unit = parse(DOSAGE_PARSE_FORMAT, ' '.join(words[-1:]))
-        med_name = ' '.join(words[2:-1])
-        return MedLogEntry(med=MedRegistry.get(med_name), dose_administrated_amount=dose_amount,
+        return datetime_obj, ' '.join(words[2:-1]), words[-1]
+
+    @classmethod
+    def from_str(cls, s: str, med: Optional[Med] = None) -> MedLogEntry:
+        """Parses a log line. The med is looked up in the registry unless it is given."""
+        datetime_obj, med_name, dosage = MedLogEntry.split_str(s)
+        dose_amount, dose_unit = _DOSAGE_PARSER.parse(dosage)
+        return MedLogEntry(med=med if med is not None else MedRegistry.get(med_name), dose_administrated_amount=dose_amount,
                            dose_administrated_unit=dose_unit, dose_administrated_date_time=datetime_obj)
 
+    @property
+    def unit(self) -> units.Unit:
+        return units.parse_unit(self.dose_administrated_unit)
+
+    @property
+    def base_dose_amount(self) -> float:
+        """The administrated amount converted to the base unit of its dimension. See units.BASE_UNITS."""
+        return self.unit.to_base(self.dose_administrated_amount)
+
     @property
     def next_dose(self):
         return NextDose(entry=self)
 
 
+class SegmentSummary:
+    """Summary of a rotated log segment, kept in a sidecar file next to the segment.
+
+    Stores the min/max timestamp, the number of entries per med and the newest entry line per med (by time, not by
+    position), along with the size of the segment it was built from so stale sidecars can be detected and rebuilt.
+    """
+    def __init__(self, *, size=0, min_time=None, max_time=None, counts=None, last=None):
+        self.size: int = size
+        self.min_time: Optional[datetime] = min_time
+        self.max_time: Optional[datetime] = max_time
+        self.counts: dict[str, int] = counts if counts is not None else {}
+        self.last: dict[str, str] = last if last is not None else {}
+
+    def add(self, line: str, entry: Optional[MedLogEntry] = None):
+        if entry is None:
+            t, med_name, _ = MedLogEntry.split_str(line)
+        else:
+            t, med_name = entry.dose_administrated_date_time, entry.med.name
+        if self.min_time is None or t < self.min_time:
+            self.min_time = t
+        if self.max_time is None or t > self.max_time:
+            self.max_time = t
+        self.counts[med_name] = self.counts.get(med_name, 0) + 1
+        if med_name not in self.last or t >= _line_time(self.last[med_name]):
+            self.last[med_name] = line if line.endswith('\n') else f'{line}\n'
+
+    def overlaps(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> bool:
+        if self.min_time is None:
+            return False
+        return (start is None or start <= self.max_time) and (end is None or self.min_time <= end)
+
+    def to_dict(self) -> dict:
+        return {'size': self.size,
+                'min_time': self.min_time.isoformat() if self.min_time else None,
+                'max_time': self.max_time.isoformat() if self.max_time else None,
+                'counts': self.counts,
+                'last': self.last}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> SegmentSummary:
+        return SegmentSummary(size=d['size'],
+                              min_time=datetime.fromisoformat(d['min_time']) if d['min_time'] else None,
+                              max_time=datetime.fromisoformat(d['max_time']) if d['max_time'] else None,
+                              counts=d['counts'],
+                              last=d['last'])
+
+    @classmethod
+    def build(cls, segment) -> SegmentSummary:
+        summary = SegmentSummary(size=os.path.getsize(segment))
+        with open(segment, 'r') as file:
+            for line in file:
+                if line.strip():
+                    summary.add(line)
+        return summary
+
+
+def _summary_file(segment) -> Path:
+    segment = Path(segment)
+    return segment.with_name(f'{segment.name}.summary.json')
+
+
+def _segment_file(log_file, key: str) -> Path:
+    log_file = Path(log_file)
+    return log_file.with_name(f'{log_file.stem}.{key}{log_file.suffix}')
+
+
+def segments(log_file=None) -> List[Path]:
+    """Returns the rotated segments of a log, oldest first. The active log file is not included."""
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    log_file = Path(log_file)
+    if not log_file.parent.is_dir():
+        return []
+    prefix, suffix = f'{log_file.stem}.', log_file.suffix
+    return sorted(path for path in log_file.parent.glob(f'{prefix}*{suffix}')
+                  if _is_segment_key(path.name[len(prefix):len(path.name) - len(suffix)]))
+
+
+def _is_segment_key(key: str) -> bool:
+    """Returns True if key is a SEGMENT_FORMAT key, which rules out sidecar, snapshot and temporary files."""
+    try:
+        return datetime.strptime(key, SEGMENT_FORMAT).strftime(SEGMENT_FORMAT) == key
+    except ValueError:
+        return False
+
+
+def segment_summary(segment) -> SegmentSummary:
+    """Loads the summary of a segment, rebuilding the sidecar if it is missing or stale."""
+    summary_file = _summary_file(segment)
+    try:
+        with open(summary_file, 'r') as file:
+            summary = SegmentSummary.from_dict(json.load(file))
+        if summary.size == os.path.getsize(segment):
+            return summary
+    except (FileNotFoundError, ValueError, KeyError):
+        pass
+    summary = SegmentSummary.build(segment)
+    _write_summary(segment, summary)
+    return summary
+
+
+def _write_summary(segment, summary: SegmentSummary):
+    with open(_summary_file(segment), 'w') as file:
+        json.dump(summary.to_dict(), file, indent=4)
+
+
+def rotate(log_file=None, now: Optional[datetime] = None) -> List[Path]:
+    """Moves entries that do not belong to the current segment out of the active log and into their segments.
+
+    Args:
+        log_file: The active log file.
+        now: The time used to determine the current segment. Defaults to the current time.
+
+    Returns:
+        The segments that were written to.
+    """
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    if now is None:
+        now = datetime.now()
+    current_key = now.strftime(SEGMENT_FORMAT)
+    try:
+        with open(log_file, 'r') as file:
+            lines = file.readlines()
+    except FileNotFoundError:
+        return []
+
+    kept = []
+    rotated: dict[str, List[str]] = {}
+    for line in lines:
+        if not line.strip():
+            continue
+        key = MedLogEntry.split_str(line)[0].strftime(SEGMENT_FORMAT)
+        if key >= current_key:
+            kept.append(line)
+        else:
+            rotated.setdefault(key, []).append(line if line.endswith('\n') else f'{line}\n')
+    if not rotated:
+        return []
+
+    written = []
+    for key, segment_lines in sorted(rotated.items()):
+        segment = _segment_file(log_file, key)
+        with open(segment, 'a') as file:
+            file.writelines(segment_lines)
+        segment_summary(segment)
+        written.append(segment)
+
+    tmp_file = Path(f'{log_file}.tmp')
+    with open(tmp_file, 'w') as file:
+        file.writelines(kept)
+    os.replace(tmp_file, log_file)
+    refresh_snapshot(log_file)
+    return written
+
+
+def _needs_rotation(log_file, now: datetime) -> bool:
+    try:
+        with open(log_file, 'r') as file:
+            first = file.readline()
+    except FileNotFoundError:
+        return False
+    if not first.strip():
+        return False
+    return MedLogEntry.split_str(first)[0].strftime(SEGMENT_FORMAT) < now.strftime(SEGMENT_FORMAT)
+
+
+def iter_log_lines(log_file=None,
+                   start: Optional[datetime] = None,
+                   end: Optional[datetime] = None) -> Iterator[str]:
+    """Yields the lines of the rotated segments followed by the active log as one seamless log.
+
+    Segments whose summary shows no entries between start and end are skipped without being read. Lines are not
+    filtered by time; callers that need exact bounds must check each entry.
+    """
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    for segment in segments(log_file):
+        if (start is not None or end is not None) and not segment_summary(segment).overlaps(start, end):
+            continue
+        with open(segment, 'r') as file:
+            yield from file
+    try:
+        with open(log_file, 'r') as file:
+            yield from file
+    except FileNotFoundError:
+        return
+
+
+class LogState:
+    """Derived state of a log: per med entry counts and the most recent entries needed by next_dose.
+
+    For each med the last max_standard_doses_per_day entries (at least one) are kept, so the last dose and the
+    rolling 24 hour window can be answered without reading the log. The state also records what it covers: the sizes
+    of the rotated segments, the first line of the active log and the byte offset into the active log.
+    """
+    def __init__(self, *, offset=0, head='', segment_sizes=None, meds=None):
+        self.offset: int = offset
+        self.head: str = head
+        self.segment_sizes: dict[str, int] = segment_sizes if segment_sizes is not None else {}
+        self.meds: dict[str, dict] = meds if meds is not None else {}
+        self._registry_cache: dict[str, Med] = {}
+
+    @property
+    def med_names(self) -> List[str]:
+        return list(self.meds)
+
+    def count(self, med_name: str) -> int:
+        return self.meds[med_name]['count'] if med_name in self.meds else 0
+
+    def recent(self, med_name: str) -> List[str]:
+        """Returns the most recent entry lines logged for a med by time, oldest first."""
+        return list(self.meds[med_name]['recent']) if med_name in self.meds else []
+
+    def last(self, med_name: str) -> Optional[str]:
+        recent = self.recent(med_name)
+        return recent[-1] if recent else None
+
+    def add(self, line: str, med: Optional[Med] = None):
+        """Adds a log line. The med of the line is looked up in the registry once per name unless it is given."""
+        if not line.strip():
+            return
+        if not line.endswith('\n'):
+            line = f'{line}\n'
+        t, med_name, _ = MedLogEntry.split_str(line)
+        if med is not None:
+            self._registry_cache.setdefault(med_name, med)
+        elif med_name not in self._registry_cache:
+            self._registry_cache[med_name] = MedRegistry.get(med_name)
+        window = self._registry_cache[med_name].max_standard_doses_per_day or 1
+        d = self.meds.setdefault(med_name, {'count': 0, 'recent': []})
+        d['count'] += 1
+        # keep the newest entries by time, lines can be appended out of order (e.g. by an import)
+        recent = d['recent']
+        i = len(recent)
+        while i and t < _line_time(recent[i - 1]):
+            i -= 1
+        d['recent'] = [*recent[:i], line, *recent[i:]][-window:]
+
+    def replay(self, log_file=None):
+        """Adds every entry after the covered offset, reading segments only when starting from zero."""
+        if not log_file:
+            log_file = DEFAULT_LOG_FILE
+        if not self.offset and not self.segment_sizes:
+            for segment in segments(log_file):
+                with open(segment, 'r') as file:
+                    for line in file:
+                        self.add(line)
+                self.segment_sizes[segment.name] = os.path.getsize(segment)
+        try:
+            with open(log_file, 'rb') as file:
+                if not self.offset:
+                    self.head = _complete_line(file.readline())
+                file.seek(self.offset)
+                for line in file:
+                    if not line.endswith(b'\n'):
+                        # a writer is part way through this line, it is replayed once it is complete
+                        break
+                    self.add(line.decode())
+                    self.offset += len(line)
+        except FileNotFoundError:
+            pass
+        return self
+
+    def covers(self, log_file=None) -> bool:
+        """Returns True if the log has only been appended to since this state was taken."""
+        if not log_file:
+            log_file = DEFAULT_LOG_FILE
+        current = {segment.name: os.path.getsize(segment) for segment in segments(log_file)}
+        if current != self.segment_sizes:
+            return False
+        if not self.offset and not self.head:
+            # nothing of the active log was covered, so anything appended to it since is tail
+            return True
+        try:
+            with open(log_file, 'rb') as file:
+                head = _complete_line(file.readline())
+                file.seek(0, os.SEEK_END)
+                size = file.tell()
+        except FileNotFoundError:
+            head, size = '', 0
+        return head == self.head and self.offset <= size
+
+    def next_dose(self, med: Med) -> NextDose:
+        """Returns the next dose of a med using only this state."""
+        return _next_dose_from_lines(med, self.recent(med.name)[::-1])
+
+    def to_dict(self) -> dict:
+        return {'offset': self.offset, 'head': self.head, 'segment_sizes': self.segment_sizes, 'meds': self.meds}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> LogState:
+        return LogState(offset=d['offset'], head=d['head'], segment_sizes=d['segment_sizes'], meds=d['meds'])
+
+    def __eq__(self, other):
+        return isinstance(other, LogState) and self.to_dict() == other.to_dict()
+
+
+def _complete_line(line: bytes) -> str:
+    return line.decode() if line.endswith(b'\n') else ''
+
+
+def _snapshot_file(log_file) -> Path:
+    return Path(f'{log_file}.snapshot.json')
+
+
+def load_snapshot(log_file=None) -> Optional[LogState]:
+    """Loads the snapshot of a log without replaying anything. Returns None if there is no readable snapshot."""
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    try:
+        with open(_snapshot_file(log_file), 'r') as file:
+            return LogState.from_dict(json.load(file))
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def load_state(log_file=None) -> LogState:
+    """Loads the snapshot of a log and replays the entries logged after it.
+
+    Falls back to a full replay if there is no snapshot or the log was rewritten (e.g. rotated) since it was taken. A
+    state rebuilt by a full replay is written as the new snapshot.
+    """
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    state = load_snapshot(log_file)
+    if state is not None and state.covers(log_file):
+        return state.replay(log_file)
+    return checkpoint(log_file, LogState().replay(log_file))
+
+
+def checkpoint(log_file=None, state: Optional[LogState] = None) -> LogState:
+    """Writes a snapshot of the derived state of a log. Uses load_state if no state is given."""
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    if state is None:
+        state = load_snapshot(log_file)
+        if state is None or not state.covers(log_file):
+            state = LogState()
+        state.replay(log_file)
+    snapshot_file = _snapshot_file(log_file)
+    tmp_file = Path(f'{snapshot_file}.tmp')
+    with open(tmp_file, 'w') as file:
+        json.dump(state.to_dict(), file)
+    os.replace(tmp_file, snapshot_file)
+    return state
+
+
+def refresh_snapshot(log_file=None):
+    """Rebuilds the snapshot of a log after the log was rewritten, if the log has a snapshot."""
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    if _snapshot_file(log_file).exists():
+        checkpoint(log_file)
+
+
+def verify_snapshot(log_file=None) -> bool:
+    """Replays the log from zero and compares the result with the snapshot brought up to date with the log tail."""
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    snapshot = load_snapshot(log_file)
+    if snapshot is None or not snapshot.covers(log_file):
+        return False
+    return snapshot.replay(log_file) == LogState().replay(log_file)
+
+
 def log(med,
         dose_administrated_amount = None,
         dose_administrated_unit = None,
         dose_administrated_date_time=None,
-        log_file=None) -> MedLogEntry:
+        log_file=None,
+        should_rotate=True) -> MedLogEntry:
     if not log_file:
         log_file = DEFAULT_LOG_FILE
     if dose_administrated_date_time is None:
@@ -77,55 +469,206 @@ def log(med,
         dose_administrated_unit = med.standard_dose_unit
     if dose_administrated_amount is None:
         dose_administrated_amount = med.standard_dose_amount
+    units.check_compatible(dose_administrated_unit, med.standard_dose_unit)
     entry = MedLogEntry(med=med,
                         dose_administrated_amount=dose_administrated_amount,
                         dose_administrated_unit=dose_administrated_unit,
                         dose_administrated_date_time=dose_administrated_date_time)
 
-    with open(log_file, 'a') as file:
+    with open_log(log_file, should_rotate=should_rotate) as file:
         file.write(f'{entry}\n')
 
     return entry
 
 
+def open_log(log_file=None, buffering=-1, should_rotate=True) -> TextIO:
+    """Opens the active log for appending, rotating it first if it holds entries from an earlier segment."""
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    if should_rotate and _needs_rotation(log_file, datetime.now()):
+        rotate(log_file)
+    return open(log_file, 'a', buffering=buffering)
+
+
+def write_entries(entries: Iterable[MedLogEntry],
+                  log_file=None,
+                  now: Optional[datetime] = None) -> int:
+    """Writes a batch of entries sorted by time, appending each one directly to the segment it belongs to.
+
+    Entries in the current segment go to the active log. Every file is opened once per batch and the summaries of
+    the segments written to are updated with the new lines instead of being rebuilt.
+
+    Returns:
+        The number of entries written.
+    """
+    if not log_file:
+        log_file = DEFAULT_LOG_FILE
+    if now is None:
+        now = datetime.now()
+    current_key = now.strftime(SEGMENT_FORMAT)
+    batches: dict[Optional[str], List[Tuple[str, MedLogEntry]]] = {}
+    for entry in sorted(entries, key=lambda e: e.dose_administrated_date_time):
+        key = entry.dose_administrated_date_time.strftime(SEGMENT_FORMAT)
+        if key >= current_key:
+            key = None
+        batches.setdefault(key, []).append((f'{entry}\n', entry))
+
+    for key, lines in batches.items():
+        if key is None:
+            with open_log(log_file) as file:
+                file.writelines(line for line, _ in lines)
+            continue
+        segment = _segment_file(log_file, key)
+        summary = segment_summary(segment) if segment.exists() else SegmentSummary()
+        with open(segment, 'a') as file:
+            file.writelines(line for line, _ in lines)
+        for line, entry in lines:
+            summary.add(line, entry)
+        summary.size = os.path.getsize(segment)
+        _write_summary(segment, summary)
+    return sum(len(lines) for lines in batches.values())
+
+
+def _line_time(line: str) -> datetime:
+    return MedLogEntry.split_str(line)[0]
+
+
+def _matched_lines_newest_first(med: Med, log_file, limit: int) -> List[str]:
+    """Collects up to limit lines logged for med, newest by time first, reading as few segments as possible.
+
+    The active log may hold entries of any time, so it is always read. Segments hold disjoint time ranges and are
+    read newest first until the remaining ones cannot contain anything newer than what was collected.
+    """
+    matched = []
+    now = datetime.now()
+
+    def take(lines):
+        for line in lines:
+            if line.strip() and MedLogEntry.split_str(line)[1] == med.name and med == MedLogEntry.from_str(line).med:
+                matched.append(line)
+        matched.sort(key=_line_time, reverse=True)
+        del matched[limit:]
+
+    try:
+        with open(log_file, 'r') as file:
+            take(file)
+    except FileNotFoundError:
+        pass
+    for segment in reversed(segments(log_file)):
+        summary = segment_summary(segment)
+        if not summary.counts.get(med.name):
+            continue
+        if len(matched) >= limit and _line_time(matched[-1]) >= summary.max_time:
+            break
+        if matched and _line_time(matched[0]) >= summary.max_time and summary.max_time + timedelta(hours=24) <= now:
+            # older entries can no longer push the next dose past the last entry's next dose
+            break
+        if limit == 1:
+            take([summary.last[med.name]])
+            continue
+        with open(segment, 'r') as file:
+            take(file)
+    return matched
+
+
 def next_dose(med: Med,
               log_file=None) -> NextDose:
 
     if not log_file:
         log_file = DEFAULT_LOG_FILE
-    name = med.name
-    matched_lines = []
-    with open(log_file, 'r') as file:
-        lines = file.readlines()
-    for line in lines:
-        entry = MedLogEntry.from_str(line)
-        if med == entry.med:
-            matched_lines.append(line)
+    max_per_24hr = med.max_standard_doses_per_day
+    state = load_snapshot(log_file)
+    if state is None or not state.covers(log_file):
+        # the segment summaries answer this without replaying the whole history
+        return _next_dose_from_lines(med, _matched_lines_newest_first(med, log_file, max_per_24hr or 1))
+    offset = state.offset
+    state.replay(log_file)
+    if state.offset - offset > DEFAULT_CHECKPOINT_INTERVAL:
+        checkpoint(log_file, state)
+    matched_lines = state.recent(med.name)[::-1]
+    if len(matched_lines) < min(max_per_24hr or 1, state.count(med.name)):
+        # the registered med allows fewer doses per day than the one given, so the snapshot kept too few entries
+        matched_lines = _matched_lines_newest_first(med, log_file, max_per_24hr or 1)
+    return _next_dose_from_lines(med, matched_lines)
+
+
+def _next_dose_from_lines(med: Med, matched_lines: List[str]) -> NextDose:
+    """Computes the next dose from the most recent lines logged for med, newest first."""
     max_per_24hr = med.max_standard_doses_per_day
     if not matched_lines or not max_per_24hr:
         return NextDose(med=med)
-    elif len(matched_lines) < max_per_24hr:
-        return MedLogEntry.from_str(matched_lines[-1]).next_dose
+    last = MedLogEntry.from_str(matched_lines[0], med)
+    if len(matched_lines) < max_per_24hr:
+        return last.next_dose
     else:
-        t = MedLogEntry.from_str(matched_lines[-max_per_24hr]).dose_administrated_date_time + timedelta(hours=24)
-        last = MedLogEntry.from_str(matched_lines[-1])
+        t = MedLogEntry.split_str(matched_lines[max_per_24hr - 1])[0] + timedelta(hours=24)
         if t > last.next_dose.time:
             return NextDose(entry=last, t_override=t)
         else:
             return NextDose(entry=last)
 
 
+class DoseTable:
+    """The doses of a log converted to base units and held in columns.
+
+    The log is read once; totals over any number of time windows are then computed from the columns (with numpy
+    when it is installed).
+    """
+    def __init__(self, log_file=None, start: Optional[datetime] = None, end: Optional[datetime] = None):
+        self.groups: dict[Tuple[str, str], int] = {}
+        self.keys: List[int] = []
+        self.times: List[float] = []
+        self.amounts: List[float] = []
+        for line in iter_log_lines(log_file, start, end):
+            if not line.strip():
+                continue
+            t, med_name, dosage = MedLogEntry.split_str(line)
+            amount, unit = _DOSAGE_PARSER.parse(dosage)
+            unit = units.parse_unit(unit)
+            self.keys.append(self.groups.setdefault((med_name, unit.base), len(self.groups)))
+            self.times.append(t.timestamp())
+            self.amounts.append(unit.to_base(amount))
+
+    def totals(self,
+               start: Optional[datetime] = None,
+               end: Optional[datetime] = None) -> dict[str, dict[str, float]]:
+        """Totals the doses per med between start and end.
+
+        Returns:
+            A mapping of med name to a mapping of base unit to total amount, e.g. {'Tylenol': {'mg': 1500.0}}.
+        """
+        sums = units.grouped_sums(self.keys, self.times, self.amounts, len(self.groups),
+                                  start.timestamp() if start is not None else None,
+                                  end.timestamp() if end is not None else None)
+        totals: dict[str, dict[str, float]] = {}
+        for (med_name, base), key in self.groups.items():
+            totals.setdefault(med_name, {})[base] = sums[key]
+        return totals
+
+
+def dose_totals(log_file=None,
+                start: Optional[datetime] = None,
+                end: Optional[datetime] = None) -> dict[str, dict[str, float]]:
+    """Totals the administrated doses per med between start and end, converted to base units. See DoseTable."""
+    return DoseTable(log_file, start, end).totals(start, end)
+
+
 def print_log(meds: Optional[Tuple[Med], List[Med]] = None,
-              log_file=None, ignore_case=False):
+              log_file=None, ignore_case=False,
+              start: Optional[datetime] = None,
+              end: Optional[datetime] = None):
     if not log_file:
         log_file = DEFAULT_LOG_FILE
 
-    with open(log_file, 'r') as file:
-        lines = file.readlines()
-
-    is_filtered = bool(not meds)
-    for line in lines:
+    is_filtered = bool(meds)
+    is_bounded = start is not None or end is not None
+    for line in iter_log_lines(log_file, start, end):
+        if not line.strip():
+            continue
         entry = MedLogEntry.from_str(line)
+        if is_bounded and not ((start is None or start <= entry.dose_administrated_date_time)
+                               and (end is None or entry.dose_administrated_date_time <= end)):
+            continue
         if ignore_case and is_filtered:
             match_found = any(m.name.casefold() == entry.med.name.casefold() for m in meds)
         elif is_filtered:
@@ -0,0 +1,87 @@
+import io
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import med_log
+from import_log import import_records, read_records
+from med import Med, MedRegistry
+from test_med_log import MedLogTestCase
+
+
+class TestImportRecords(MedLogTestCase):
+    def test_import_csv(self):
+        csv_file = io.StringIO('medicine,dosage,time\n'
+                               'Tylenol,250mg,02/01/2020 09:00\n'
+                               'tylenol,,01/01/2020 08:00\n'
+                               'Tylenoll,500mg,01/02/2020 08:00\n'
+                               'Advil,lots,01/03/2020 08:00\n'
+                               'Advil,200mg,not a time\n')
+
+        report = import_records(read_records(csv_file, 'csv'), batch_size=1)
+
+        self.assertEqual(5, report.rows)
+        self.assertEqual(2, report.imported)
+        self.assertEqual(2, report.invalid)
+        self.assertEqual({'Tylenoll': 1}, report.unknown)
+        self.assertEqual(['Tylenol'], report.suggestions['Tylenoll'])
+        self.assertEqual([Path('logs/med.2020-01.log'), Path('logs/med.2020-02.log')], med_log.segments())
+        self.assertEqual({'Tylenol': 1}, med_log.segment_summary(Path('logs/med.2020-01.log')).counts)
+        self.assertEqual(2, med_log.load_state().count('Tylenol'))
+
+    def test_import_jsonl_sorts_batches(self):
+        jsonl_file = io.StringIO('{"medicine": "Advil", "time": "01/03/2020 08:00"}\n'
+                                 '{"medicine": "Advil", "dosage": "400mg", "time": "01/02/2020 08:00"}\n')
+
+        report = import_records(read_records(jsonl_file, 'jsonl'))
+
+        self.assertEqual(2, report.imported)
+        lines = Path('logs/med.2020-01.log').read_text().splitlines()
+        self.assertEqual(['01/02/2020 08:00 Advil 400.0mg', '01/03/2020 08:00 Advil 200mg'], lines)
+
+    def test_import_jsonl_reports_bad_lines(self):
+        jsonl_file = io.StringIO('{"medicine": "Advil", "time": "01/03/2020 08:00"}\n'
+                                 'not json\n'
+                                 '[1]\n'
+                                 '{"medicine": "Advil", "time": "01/04/2020 08:00"}\n')
+
+        report = import_records(read_records(jsonl_file, 'jsonl'))
+
+        self.assertEqual(4, report.rows)
+        self.assertEqual(2, report.imported)
+        self.assertEqual(2, report.invalid)
+        self.assertTrue(report.errors[0].startswith('row 2: invalid record'))
+        self.assertEqual('row 3: expected an object, got list', report.errors[1])
+
+    def test_import_older_rows_keeps_next_dose(self):
+        med = Med(name='Ibuprofen',
+                  standard_dose_amount=400,
+                  standard_dose_unit='mg',
+                  time_between_standard_doses=timedelta(hours=6),
+                  max_standard_doses_per_day=4)
+        MedRegistry.register(med)
+        now = datetime.now().replace(second=0, microsecond=0)
+        med_log.log(med, dose_administrated_date_time=now - timedelta(hours=1))
+        expected = med_log.next_dose(med).time
+        older = (now - timedelta(hours=10)).strftime(med_log.DEFAULT_DATE_TIME_FORMAT)
+
+        import_records([{'medicine': 'Ibuprofen', 'time': older}])
+
+        self.assertEqual(now + timedelta(hours=5), expected)
+        self.assertEqual(expected, med_log.next_dose(med).time)
+        self.assertEqual(expected, med_log.load_state().next_dose(med).time)
+        self.assertEqual(expected, med_log.LogState().replay().next_dose(med).time)
+
+    def test_import_reports_incompatible_unit(self):
+        report = import_records([{'medicine': 'Advil', 'dosage': '5ml', 'time': '01/03/2020 08:00'}])
+
+        self.assertEqual(0, report.imported)
+        self.assertEqual(["row 1: The unit 'ml' cannot be converted to 'mg'."], report.errors)
+
+    def test_import_rotates_active_log(self):
+        med_log.log(self.other, dose_administrated_date_time=datetime(2020, 1, 3, 8, 0), should_rotate=False)
+        now = datetime.now().strftime(med_log.DEFAULT_DATE_TIME_FORMAT)
+
+        import_records([{'medicine': 'Advil', 'time': now}])
+
+        self.assertEqual([Path('logs/med.2020-01.log')], med_log.segments())
+        self.assertEqual(1, len(Path(med_log.DEFAULT_LOG_FILE).read_text().splitlines()))
@@ -0,0 +1,26 @@
+from unittest import TestCase
+
+from input_stuff import StrCaseConversion, compiled_parser, parsed_input, select
+
+
+class TestInputStuff(TestCase):
+    def test_case_conversion(self):
+        self.assertEqual('abc', StrCaseConversion.to_lower('AbC'))
+        self.assertEqual('ABC', StrCaseConversion.to_upper('AbC'))
+        self.assertEqual('Abc', StrCaseConversion.capitalize('aBC'))
+        self.assertEqual('strasse', StrCaseConversion.casefold('STRASSE'))
+        self.assertEqual('AbC', StrCaseConversion.no_conversion('AbC'))
+
+    def test_compiled_parser_is_cached(self):
+        self.assertIs(compiled_parser('{:g}{}'), compiled_parser('{:g}{}'))
+
+    def test_parsed_input(self):
+        replies = iter(['bad', ' 30ml '])
+        result = parsed_input('', pattern='{:g}{}', input_func=lambda _: next(replies))
+        self.assertEqual((30, 'ml'), tuple(result))
+
+    def test_select(self):
+        replies = iter(['', 'N'])
+        self.assertEqual('no', select('?', ('yes', 'no', 'stop asking'), input_func=lambda _: next(replies)))
+        self.assertEqual('yes', select('?', {'y': 'yes', 'n': 'no'}, input_func=lambda _: 'Y'))
+        self.assertEqual('ml', select('?', ('ml', 'mg'), input_func=lambda _: 'mls', options_are_abbreviations=True))
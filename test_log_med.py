@@ -0,0 +1,36 @@
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import med_log
+from log_med import run_batch
+from test_med_log import MedLogTestCase
+
+
+class TestRunBatch(MedLogTestCase):
+    def test_batch_prints_next_dose_once_per_med(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        time_format = r'%m-%d-%Y_%H:%M'
+        lines = [f'-m Tylenol -t {(now - timedelta(hours=6)).strftime(time_format)}\n',
+                 f'-m Advil -d 400mg -t {(now - timedelta(hours=1)).strftime(time_format)}\n',
+                 '-m Unknown\n',
+                 f'--medicine=tylenol -d 250mg --time {(now - timedelta(hours=5)).strftime(time_format)}\n']
+        output = []
+
+        failures = run_batch(lines, time_format=time_format, output=output.append)
+
+        self.assertEqual(1, failures)
+        self.assertEqual(3, len(Path(med_log.DEFAULT_LOG_FILE).read_text().splitlines()))
+        self.assertEqual([f'Tylenol {med_log.next_dose(self.med)}', f'Advil {med_log.next_dose(self.other)}'],
+                         output)
+
+    def test_batch_stream(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        time_format = r'%m-%d-%Y_%H:%M'
+        lines = [f'-m Tylenol -t {(now - timedelta(hours=6)).strftime(time_format)}',
+                 f'-m Tylenol -t {(now - timedelta(hours=5)).strftime(time_format)}']
+        output = []
+
+        run_batch(lines, time_format=time_format, stream=True, output=output.append)
+
+        self.assertEqual(2, len(output))
+        self.assertEqual(f'Tylenol {med_log.next_dose(self.med)}', output[-1])
@@ -0,0 +1,45 @@
+import os
+import tempfile
+from datetime import timedelta
+from unittest import TestCase
+
+from med import Med, MedRegistry
+
+
+class TestMedRegistryPreload(TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.directory = self._tmp.name
+        for i in range(20):
+            MedRegistry.register(Med(name=f'Med {i}',
+                                     standard_dose_amount=i,
+                                     standard_dose_unit='mg',
+                                     time_between_standard_doses=timedelta(hours=4)),
+                                 directory=self.directory)
+
+    def tearDown(self):
+        MedRegistry.clear_preloaded(self.directory)
+        self._tmp.cleanup()
+
+    def test_preload(self):
+        meds = MedRegistry.preload(self.directory, workers=4)
+
+        self.assertEqual({f'Med {i}' for i in range(20)}, set(meds))
+        self.assertIs(meds['Med 3'], MedRegistry.get('med 3', directory=self.directory))
+        self.assertEqual('Med 3', MedRegistry.find_near_matches('Med 3', directory=self.directory)[0].med.name)
+
+    def test_clear_preloaded(self):
+        MedRegistry.preload(self.directory)
+        os.remove(os.path.join(self.directory, 'med_3.json'))
+
+        MedRegistry.clear_preloaded(self.directory)
+
+        with self.assertRaises(KeyError):
+            MedRegistry.get('Med 3', directory=self.directory)
+        self.assertEqual({}, MedRegistry._preloaded)
+
+    def test_preload_with_processes(self):
+        meds = MedRegistry.preload(self.directory, workers=2, use_processes=True)
+
+        self.assertEqual(20, len(meds))
+        self.assertEqual(timedelta(hours=4), meds['Med 7'].time_between_standard_doses)
@@ -0,0 +1,195 @@
+import io
+import os
+import tempfile
+from contextlib import redirect_stdout
+from datetime import datetime, timedelta
+from pathlib import Path
+from unittest import TestCase
+
+import med_log
+from med import Med, MedRegistry
+
+
+class MedLogTestCase(TestCase):
+    def setUp(self):
+        self._cwd = os.getcwd()
+        self._tmp = tempfile.TemporaryDirectory()
+        os.chdir(self._tmp.name)
+        os.mkdir('meds')
+        os.mkdir('logs')
+        self.med = Med(name='Tylenol',
+                       standard_dose_amount=500,
+                       standard_dose_unit='mg',
+                       time_between_standard_doses=timedelta(hours=4),
+                       max_standard_doses_per_day=2)
+        self.other = Med(name='Advil',
+                         standard_dose_amount=200,
+                         standard_dose_unit='mg',
+                         time_between_standard_doses=timedelta(hours=6))
+        MedRegistry.register(self.med)
+        MedRegistry.register(self.other)
+
+    def tearDown(self):
+        os.chdir(self._cwd)
+        self._tmp.cleanup()
+
+    def print_log(self, **kwargs) -> str:
+        out = io.StringIO()
+        with redirect_stdout(out):
+            med_log.print_log(**kwargs)
+        return out.getvalue()
+
+
+class TestRotation(MedLogTestCase):
+    def test_rotate_into_segments(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        old = datetime(2020, 1, 15, 8, 0)
+        med_log.log(self.med, dose_administrated_date_time=old, should_rotate=False)
+        med_log.log(self.other, dose_administrated_date_time=old + timedelta(days=40), should_rotate=False)
+        med_log.log(self.med, dose_administrated_date_time=now, should_rotate=False)
+        before = self.print_log()
+
+        written = med_log.rotate()
+
+        self.assertEqual([Path('logs/med.2020-01.log'), Path('logs/med.2020-02.log')], written)
+        Path('logs/med.2020.log').write_text('')  # a key in another format is not a segment
+        self.assertEqual(written, med_log.segments())
+        self.assertEqual(1, len(Path(med_log.DEFAULT_LOG_FILE).read_text().splitlines()))
+        self.assertEqual(before, self.print_log())
+
+        summary = med_log.segment_summary(written[0])
+        self.assertEqual({'Tylenol': 1}, summary.counts)
+        self.assertEqual(old, summary.min_time)
+        self.assertEqual(old, summary.max_time)
+        self.assertTrue(Path('logs/med.2020-01.log.summary.json').is_file())
+
+    def test_print_log_time_bounds(self):
+        old = datetime(2020, 1, 15, 8, 0)
+        med_log.log(self.med, dose_administrated_date_time=old, should_rotate=False)
+        med_log.log(self.med, dose_administrated_date_time=old + timedelta(days=40), should_rotate=False)
+        med_log.rotate()
+
+        out = self.print_log(start=old + timedelta(days=1))
+
+        self.assertEqual(1, len(out.splitlines()))
+        self.assertIn('02/24/2020', out)
+
+    def test_next_dose_across_segments(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        first = now - timedelta(hours=6)
+        med_log.log(self.med, dose_administrated_date_time=first, should_rotate=False)
+        med_log.log(self.med, dose_administrated_date_time=now - timedelta(hours=5), should_rotate=False)
+        expected = med_log.next_dose(self.med).time
+
+        med_log.rotate(now=now + timedelta(days=400))
+
+        self.assertEqual(first + timedelta(hours=24), expected)
+        self.assertEqual(expected, med_log.next_dose(self.med).time)
+
+    def test_rotate_log_without_extension(self):
+        log_file = 'logs/medlog'
+        old = datetime(2020, 1, 15, 8, 0)
+        med_log.log(self.med, dose_administrated_date_time=old, log_file=log_file, should_rotate=False)
+        med_log.log(self.med, dose_administrated_date_time=old + timedelta(days=40), log_file=log_file,
+                    should_rotate=False)
+        med_log.checkpoint(log_file)
+
+        med_log.rotate(log_file)
+
+        self.assertEqual([Path('logs/medlog.2020-01'), Path('logs/medlog.2020-02')], med_log.segments(log_file))
+        self.assertTrue(Path('logs/medlog.2020-01.summary.json').is_file())
+        self.assertTrue(Path('logs/medlog.2020-02.summary.json').is_file())
+        self.assertEqual(2, len(self.print_log(log_file=log_file).splitlines()))
+
+
+class TestSnapshot(MedLogTestCase):
+    def test_checkpoint_and_replay_tail(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        med_log.log(self.med, dose_administrated_date_time=now - timedelta(hours=6))
+        med_log.log(self.other, dose_administrated_date_time=now - timedelta(hours=5))
+        med_log.checkpoint()
+        med_log.log(self.med, dose_administrated_date_time=now - timedelta(hours=4))
+
+        state = med_log.load_state()
+
+        self.assertEqual(state, med_log.LogState().replay())
+        self.assertEqual(['Tylenol', 'Advil'], state.med_names)
+        self.assertEqual(2, state.count('Tylenol'))
+        self.assertTrue(med_log.verify_snapshot())
+        self.assertEqual(now - timedelta(hours=6) + timedelta(hours=24), med_log.next_dose(self.med).time)
+
+    def test_snapshot_refreshed_by_rotation(self):
+        old = datetime(2020, 1, 15, 8, 0)
+        med_log.log(self.med, dose_administrated_date_time=old, should_rotate=False)
+        med_log.checkpoint()
+        med_log.log(self.med, should_rotate=False)
+        med_log.rotate()
+
+        self.assertTrue(med_log.verify_snapshot())
+        self.assertEqual(2, med_log.load_state().count('Tylenol'))
+
+        with open('logs/med.2020-01.log', 'a') as file:
+            file.write('01/16/2020 08:00 Tylenol 500mg\n')
+        self.assertFalse(med_log.verify_snapshot())
+        self.assertEqual(3, med_log.load_state().count('Tylenol'))
+        self.assertTrue(med_log.verify_snapshot())
+
+    def test_snapshot_of_empty_active_log(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        med_log.log(self.med, dose_administrated_date_time=datetime(2020, 1, 15, 8, 0), should_rotate=False)
+        med_log.rotate()
+        med_log.checkpoint()
+        self.assertEqual('', Path(med_log.DEFAULT_LOG_FILE).read_text())
+
+        med_log.log(self.med, dose_administrated_date_time=now - timedelta(hours=1))
+
+        snapshot = med_log.load_snapshot()
+        self.assertEqual(0, snapshot.offset)
+        self.assertTrue(snapshot.covers())
+        self.assertEqual(now + timedelta(hours=3), med_log.next_dose(self.med).time)
+        self.assertTrue(med_log.verify_snapshot())
+
+    def test_next_dose_without_snapshot(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        med_log.log(self.med, dose_administrated_date_time=datetime(2020, 1, 15, 8, 0), should_rotate=False)
+        med_log.log(self.med, dose_administrated_date_time=now - timedelta(hours=1), should_rotate=False)
+        med_log.rotate()
+
+        self.assertEqual(now + timedelta(hours=3), med_log.next_dose(self.med).time)
+        self.assertIsNone(med_log.load_snapshot())
+
+    def test_replay_stops_at_partial_line(self):
+        now = datetime.now().replace(second=0, microsecond=0)
+        line = f'{(now - timedelta(hours=1)).strftime(med_log.DEFAULT_DATE_TIME_FORMAT)} Tylenol 500mg\n'
+        with open(med_log.DEFAULT_LOG_FILE, 'w') as file:
+            file.write(line)
+            file.write(line[:-4])
+
+        state = med_log.load_state()
+
+        self.assertEqual(1, state.count('Tylenol'))
+        self.assertEqual(len(line), state.offset)
+        with open(med_log.DEFAULT_LOG_FILE, 'a') as file:
+            file.write(line[-4:])
+        self.assertEqual(2, med_log.load_state().count('Tylenol'))
+        self.assertEqual(now - timedelta(hours=1) + timedelta(hours=24), med_log.next_dose(self.med).time)
+        self.assertTrue(med_log.verify_snapshot())
+
+
+class TestDoseTotals(MedLogTestCase):
+    def test_totals_in_base_units(self):
+        day = datetime(2020, 1, 15, 8, 0)
+        med_log.log(self.med, dose_administrated_date_time=day, should_rotate=False)
+        med_log.log(self.med, 0.25, 'g', day + timedelta(hours=4), should_rotate=False)
+        med_log.log(self.other, dose_administrated_date_time=day + timedelta(days=1), should_rotate=False)
+        med_log.rotate()
+
+        self.assertEqual({'Tylenol': {'mg': 750.0}, 'Advil': {'mg': 200.0}}, med_log.dose_totals())
+        table = med_log.DoseTable()
+        self.assertEqual({'Tylenol': {'mg': 250.0}, 'Advil': {'mg': 0.0}},
+                         table.totals(day + timedelta(hours=1), day + timedelta(hours=5)))
+
+    def test_log_rejects_incompatible_unit(self):
+        with self.assertRaises(ValueError):
+            med_log.log(self.med, 5, 'ml')
+
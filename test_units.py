@@ -0,0 +1,30 @@
+from unittest import TestCase
+
+import units
+
+
+class TestParseUnit(TestCase):
+    def test_known_units(self):
+        self.assertEqual(units.parse_unit('ml'), units.parse_unit('mL'))
+        self.assertEqual(units.VOLUME, units.parse_unit('Teaspoons').dimension)
+        self.assertEqual(1500, units.to_base(1.5, 'g'))
+        self.assertEqual('mg', units.parse_unit('mcg').base)
+
+    def test_micro_sign(self):
+        for spelling in ('\u00b5g', '\u03bcg', '\u00b5G'):
+            self.assertEqual(units.parse_unit('mcg').scale, units.parse_unit(spelling).scale)
+            self.assertEqual(units.MASS, units.parse_unit(spelling).dimension)
+        units.check_compatible('mg', '\u00b5g')
+
+    def test_unknown_units_match_own_spelling(self):
+        self.assertTrue(units.parse_unit('Sprays').is_compatible(units.parse_unit('spray')))
+        self.assertFalse(units.parse_unit('spray').is_compatible(units.parse_unit('ml')))
+
+    def test_check_compatible(self):
+        units.check_compatible('g', 'mg')
+        with self.assertRaises(ValueError):
+            units.check_compatible('ml', 'mg')
+
+    def test_grouped_sums(self):
+        sums = units.grouped_sums([0, 1, 0, 1], [1, 2, 3, 4], [1.0, 2.0, 3.0, 4.0], 3, start=2, end=3)
+        self.assertEqual([3.0, 2.0, 0.0], sums)
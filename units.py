@@ -0,0 +1,105 @@
+import functools
+from dataclasses import dataclass
+from typing import Union, Sequence, Optional
+
+try:
+    import numpy
+except ImportError:  # numpy is optional, totals fall back to plain python
+    numpy = None
+
+MASS = 'mass'
+VOLUME = 'volume'
+COUNT = 'count'
+ACTIVITY = 'activity'
+
+BASE_UNITS = {MASS: 'mg', VOLUME: 'ml', COUNT: 'count', ACTIVITY: 'iu'}
+
+# name -> (dimension, number of base units in one of this unit)
+_UNIT_TABLE = {
+    'mcg': (MASS, 0.001), 'ug': (MASS, 0.001), 'µg': (MASS, 0.001), 'microgram': (MASS, 0.001),
+    'mg': (MASS, 1), 'milligram': (MASS, 1),
+    'g': (MASS, 1000), 'gram': (MASS, 1000),
+    'kg': (MASS, 1000000), 'kilogram': (MASS, 1000000),
+    'ml': (VOLUME, 1), 'milliliter': (VOLUME, 1), 'millilitre': (VOLUME, 1), 'cc': (VOLUME, 1),
+    'l': (VOLUME, 1000), 'liter': (VOLUME, 1000), 'litre': (VOLUME, 1000),
+    'tsp': (VOLUME, 4.92892), 'teaspoon': (VOLUME, 4.92892),
+    'tbsp': (VOLUME, 14.7868), 'tablespoon': (VOLUME, 14.7868),
+    'floz': (VOLUME, 29.5735),
+    'count': (COUNT, 1), 'tablet': (COUNT, 1), 'tab': (COUNT, 1), 'pill': (COUNT, 1), 'capsule': (COUNT, 1),
+    'cap': (COUNT, 1), 'puff': (COUNT, 1), 'drop': (COUNT, 1), 'patch': (COUNT, 1),
+    'iu': (ACTIVITY, 1), 'unit': (ACTIVITY, 1),
+}
+# parse_unit casefolds its input, which turns the micro sign into a greek mu, so the keys are casefolded the same way
+_UNIT_TABLE = {name.casefold(): value for name, value in _UNIT_TABLE.items()}
+
+
+@dataclass(frozen=True)
+class Unit:
+    """A parsed unit. Amounts in this unit are multiplied by scale to get an amount in the base unit."""
+    name: str
+    dimension: str
+    scale: float
+
+    @property
+    def base(self) -> str:
+        return BASE_UNITS.get(self.dimension, self.dimension)
+
+    def is_compatible(self, other: 'Unit') -> bool:
+        return self.dimension == other.dimension
+
+    def to_base(self, amount: Union[int, float]) -> float:
+        return amount * self.scale
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_unit(unit: str) -> Unit:
+    """Parses a free-form unit string such as 'mL' or 'Tablets'. Results are interned, so repeats are a cache hit.
+
+    Units that are not known become their own dimension, which makes them compatible only with the same spelling
+    (ignoring case, spaces and a plural 's').
+    """
+    key = unit.strip().casefold().replace(' ', '').replace('.', '')
+    if key not in _UNIT_TABLE and key.endswith('s') and key[:-1] in _UNIT_TABLE:
+        key = key[:-1]
+    if key in _UNIT_TABLE:
+        dimension, scale = _UNIT_TABLE[key]
+        return Unit(name=key, dimension=dimension, scale=scale)
+    if key.endswith('s') and len(key) > 1:
+        key = key[:-1]
+    return Unit(name=key, dimension=key, scale=1)
+
+
+def check_compatible(unit: str, expected: str):
+    """Raises a ValueError if unit cannot be converted to the expected unit."""
+    if not parse_unit(unit).is_compatible(parse_unit(expected)):
+        raise ValueError(f'The unit {unit!r} cannot be converted to {expected!r}.')
+
+
+def to_base(amount: Union[int, float], unit: str) -> float:
+    """Converts an amount to the base unit of its dimension."""
+    return parse_unit(unit).to_base(amount)
+
+
+def grouped_sums(keys: Sequence[int],
+                 times: Sequence[float],
+                 amounts: Sequence[float],
+                 group_count: int,
+                 start: Optional[float] = None,
+                 end: Optional[float] = None) -> list:
+    """Sums amounts per group key for the values with start <= time <= end. Uses numpy when it is installed."""
+    if numpy is not None:
+        keys = numpy.asarray(keys, dtype=numpy.intp)
+        times = numpy.asarray(times, dtype=float)
+        amounts = numpy.asarray(amounts, dtype=float)
+        mask = numpy.ones(len(times), dtype=bool)
+        if start is not None:
+            mask &= times >= start
+        if end is not None:
+            mask &= times <= end
+        return numpy.bincount(keys[mask], weights=amounts[mask], minlength=group_count).tolist()
+
+    sums = [0.0] * group_count
+    for key, t, amount in zip(keys, times, amounts):
+        if (start is None or start <= t) and (end is None or t <= end):
+            sums[key] += amount
+    return sums
@@ -65,6 +65,13 @@ def main(args: Optional[List[str]]):
                         default=None,
                         help='The directory where medicine files are stored.')
 
+        ap.add_argument('--checkpoint',
+                        action='store_true',
+                        help='Writes a snapshot of the derived log state.')
+        ap.add_argument('--verify-snapshot',
+                        action='store_true',
+                        help='Replays the log from the beginning and compares the result with the snapshot.')
+
         # Setup output group
         ap.output_group = ap.add_mutually_exclusive_group()
         ap.output_group.add_argument('-v', '--verbose', action='store_true', help='Outputs more information.')
@@ -89,6 +96,19 @@ def main(args: Optional[List[str]]):
         meds_dir = args.meds_dir
         out_file = args.output_file
 
+        if args.checkpoint:
+            state = med_log.checkpoint()
+            if not is_quiet:
+                print(f'snapshot written: {len(state.med_names)} meds, offset {state.offset}')
+            return
+        if args.verify_snapshot:
+            is_valid = med_log.verify_snapshot()
+            if not is_quiet:
+                print('snapshot is valid' if is_valid else 'snapshot is stale or does not match the log')
+            if not is_valid:
+                raise SystemExit(1)
+            return
+
         # TODO - Use the arguments to filter output.
         med_log.print_log()
 